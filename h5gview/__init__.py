@@ -6,8 +6,13 @@ from PySide6 import QtWidgets
 from h5gview import ui
 from h5gview.core import FileFactory
 from h5gview.h5 import H5File
+from h5gview.npy import NpyFile, NpzFile, RawFile
 
 FileFactory.add_extensions(['h5', 'hdf5'], H5File)
+FileFactory.add_extension('npy', NpyFile)
+FileFactory.add_extension('npz', NpzFile)
+FileFactory.add_extensions(['raw', 'bin'], RawFile)
+FileFactory.load_entry_points()
 
 log = logging.getLogger(__name__)
 
@@ -11,6 +11,8 @@ if __name__ == '__main__':
         print('h5gview usage information')
         print(16 * '-')
         print('Use "open file1 file2 file3 ..."')
+        print('Use "rechunk file" to analyse chunk layouts')
+        print('Use "rechunk file output_file [dataset1 dataset2 ...]" to rewrite datasets with suggested chunks')
         quit()
 
     command = sys.argv[1]
@@ -28,3 +30,24 @@ if __name__ == '__main__':
         fg = FileGroup(filelist=filelist)
         tree = fg.get_tree()
         pass
+
+    elif command == 'rechunk':
+
+        from h5gview import rechunk
+        from h5gview.core import FileGroup
+        fg = FileGroup(filelist=sys.argv[2:3])
+        if len(fg.files) == 0:
+            log.error(f'Failed to open {" ".join(sys.argv[2:3])}')
+            sys.exit(1)
+
+        try:
+            datasets = rechunk.select_datasets(fg, sys.argv[4:] if len(sys.argv) > 4 else None)
+        except ValueError as exc:
+            log.error(exc)
+            sys.exit(1)
+
+        for dataset in datasets:
+            print(rechunk.report(dataset))
+
+        if len(sys.argv) > 3:
+            rechunk.repack(fg, sys.argv[3], dataset_paths=[d.path for d in datasets])
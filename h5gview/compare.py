@@ -0,0 +1,212 @@
+import hashlib
+import logging
+from concurrent.futures import Future
+from typing import Dict, List, Set, Tuple, Type
+
+import numpy as np
+
+from h5gview import core
+from h5gview import workers
+
+log = logging.getLogger(__name__)
+
+
+# Sub-block size used for hashing contiguous datasets
+contiguous_hash_bytes = 2**20
+
+# Maximum number of changed ranges listed in details
+max_listed_ranges = 10
+
+
+def _digest(data: np.ndarray) -> str:
+    if data.dtype.kind == 'O':
+        raw = repr(data.tolist()).encode()
+    else:
+        raw = np.ascontiguousarray(data).tobytes()
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _equal(a, b) -> bool:
+    try:
+        return bool(np.array_equal(np.asarray(a), np.asarray(b)))
+    except (TypeError, ValueError):
+        return a == b
+
+
+def _hash_block(sources: List[Tuple[Type[core.File], str]], dataset_path: str,
+                selection: Tuple[slice, ...], chunks: Tuple[int, ...]) -> List[Tuple[slice, ...]]:
+    # Hash every chunk of the same block in every file, return (dataset) ranges of chunks which differ
+    block = tuple(s.stop - s.start for s in selection)
+    sub_selections = list(workers.iter_blocks(block, chunks))
+
+    digests = None
+    for file_type, file_path in sources:
+        data = np.asarray(file_type.read_slice(file_path, dataset_path, selection))
+        file_digests = [_digest(data[sub]) for sub in sub_selections]
+        if digests is None:
+            digests = file_digests
+            continue
+        digests = [d if d == f else None for d, f in zip(digests, file_digests)]
+
+    return [tuple(slice(s.start + o.start, s.stop + o.start) for s, o in zip(sub, selection))
+            for sub, d in zip(sub_selections, digests) if d is None]
+
+
+def format_selection(selection: Tuple[slice, ...]) -> str:
+    return '[' + ', '.join(f'{s.start}:{s.stop}' for s in selection) + ']'
+
+
+def format_ranges(ranges: List[Tuple[slice, ...]]) -> str:
+    details = 'Changed in ' + ', '.join(format_selection(r) for r in ranges[:max_listed_ranges])
+    if len(ranges) > max_listed_ranges:
+        details += f' and {len(ranges) - max_listed_ranges} more chunk(s)'
+    return details
+
+
+class DatasetComparison:
+
+    def __init__(self, path: str):
+        self.path = path
+        self.status = 'pending'
+        self.details = ''
+        self.ranges: List[Tuple[slice, ...]] = []
+
+    def __repr__(self):
+        return f'DatasetComparison("{self.path}", {self.status})'
+
+
+class Comparison:
+
+    def __init__(self, filegroup: core.FileGroup, early_exit: bool = True):
+        self.filegroup = filegroup
+        self.early_exit = early_exit
+
+        self.results: Dict[str, DatasetComparison] = {}
+        self._futures: Dict[Future, Tuple[str, Tuple[slice, ...]]] = {}
+        self._remaining: Dict[str, Set[Future]] = {}
+
+    def __repr__(self):
+        return f'Comparison({self.filegroup})'
+
+    @property
+    def done(self) -> bool:
+        return len(self._futures) == 0
+
+    def _compare_metadata(self, datasets: List[core.Dataset]) -> str:
+        for attr in ('shape', 'dtype'):
+            values = [getattr(d, attr) for d in datasets]
+            if any(v != values[0] for v in values[1:]):
+                return f'{attr} ' + ' != '.join(str(v) for v in values)
+
+        # Attached attributes, first difference by name
+        attributes = [{a.name: a.data for a in d.attributes} for d in datasets]
+        for name in sorted(set().union(*attributes)):
+            missing = [d.file.name for d, attrs in zip(datasets, attributes) if name not in attrs]
+            if len(missing) > 0:
+                return f'attribute "{name}" missing in ' + ', '.join(missing)
+
+            values = [attrs[name] for attrs in attributes]
+            if any(not _equal(v, values[0]) for v in values[1:]):
+                return f'attribute "{name}" ' + ' != '.join(str(v) for v in values)
+
+        return ''
+
+    def start(self):
+        log.info(f'Start {self}')
+
+        files = self.filegroup.files
+        if len(files) < 2:
+            log.warning(f'{self.filegroup} has less than two files, nothing to compare')
+            return
+
+        pool = workers.process_pool()
+        for path, datasets in self.filegroup.datasets_by_path().items():
+            result = DatasetComparison(path)
+            self.results[path] = result
+
+            # Dataset does not exist in all files
+            missing = [files[file_id].name for file_id in files if file_id not in datasets]
+            if len(missing) > 0:
+                result.status = 'missing'
+                result.details = 'Missing in ' + ', '.join(missing)
+                continue
+
+            # Check metadata before reading any data
+            datasets = list(datasets.values())
+            result.details = self._compare_metadata(datasets)
+            if result.details != '':
+                result.status = 'differing'
+                continue
+
+            first = datasets[0]
+            if np.prod(first.shape) == 0:
+                result.status = 'identical'
+                continue
+
+            # Hash chunks within large chunk-aligned blocks
+            sources = [(type(d.file), d.file.path) for d in datasets]
+            itemsize = np.dtype(first.dtype).itemsize
+            chunks = first.chunks
+            if chunks is None:
+                chunks = workers.block_shape(first.shape, None, itemsize, contiguous_hash_bytes)
+            block = workers.block_shape(first.shape, chunks, itemsize)
+            self._remaining[path] = set()
+            for selection in workers.iter_blocks(first.shape, block):
+                future = pool.submit(_hash_block, sources, path, selection, chunks)
+                self._futures[future] = path, selection
+                self._remaining[path].add(future)
+
+    def cancel(self):
+        for future in self._futures:
+            future.cancel()
+        self._futures.clear()
+        self._remaining.clear()
+
+    def _cancel_dataset(self, path: str):
+        for future in self._remaining.pop(path, set()):
+            future.cancel()
+            self._futures.pop(future, None)
+
+    def update(self) -> bool:
+        # Collect finished blocks, returns True if anything changed
+        finished = [f for f in self._futures if f.done()]
+        for future in finished:
+            if future not in self._futures:
+                continue
+            path, selection = self._futures.pop(future)
+            self._remaining[path].discard(future)
+            result = self.results[path]
+
+            try:
+                changed = future.result()
+            except Exception as exc:
+                log.warning(f'Failed to compare {path} at {format_selection(selection)}: {exc}')
+                result.status = 'failed'
+                result.details = str(exc)
+                self._cancel_dataset(path)
+                continue
+
+            if len(changed) > 0:
+                result.status = 'differing'
+                result.ranges.extend(changed)
+                result.details = format_ranges(result.ranges)
+                if self.early_exit:
+                    self._cancel_dataset(path)
+                    continue
+
+            if path in self._remaining and len(self._remaining[path]) == 0:
+                del self._remaining[path]
+                if result.status == 'pending':
+                    result.status = 'identical'
+
+        if len(finished) > 0 and self.done:
+            log.info(f'Finished {self}')
+
+        return len(finished) > 0
+
+    def summary(self) -> Dict[str, List[str]]:
+        summary: Dict[str, List[str]] = {}
+        for path, result in self.results.items():
+            summary.setdefault(result.status, []).append(path)
+
+        return summary
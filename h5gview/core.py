@@ -1,4 +1,5 @@
 from __future__ import annotations
+import importlib.metadata
 import logging
 import os
 from abc import ABC, abstractmethod
@@ -50,6 +51,14 @@ class FileGroup:
             log.warning(f'Provided file argument {file} is not compatible')
             return
 
+    def datasets_by_path(self) -> Dict[str, Dict[str, Dataset]]:
+        # Match datasets with same path across files (keyed by file ID)
+        matched: Dict[str, Dict[str, Dataset]] = {}
+        for dataset in self.datasets:
+            matched.setdefault(dataset.path, {})[dataset.file.id] = dataset
+
+        return matched
+
     def get_tree(self) -> Dict[str, Any]:
         toplevel: Dict[str, dict] = {}
         for file in self.files.values():
@@ -116,6 +125,18 @@ class File(Item):
     def read(self):
         pass
 
+    @classmethod
+    @abstractmethod
+    def read_slice(cls, path: str, dataset_path: str, selection: Tuple[slice, ...]) -> np.ndarray:
+        # Read selection from dataset without a File instance (used by worker processes)
+        pass
+
+    @classmethod
+    @abstractmethod
+    def scan_storage(cls, path: str) -> List[StorageInfo]:
+        # Collect storage information for all datasets in file without a File instance (used by worker processes)
+        pass
+
 
 class FileFactory:
 
@@ -154,6 +175,28 @@ class FileFactory:
     def add_extensions(cls, extensions: Union[list, tuple], file_type: Type[File]):
         [cls.add_extension(ext, file_type) for ext in extensions]
 
+    @classmethod
+    def load_entry_points(cls, group: str = 'h5gview.backends'):
+        # Entry point names are file extensions, values are File subclasses
+        entry_points = importlib.metadata.entry_points()
+        if hasattr(entry_points, 'select'):
+            entry_points = entry_points.select(group=group)
+        else:
+            entry_points = entry_points.get(group, [])
+
+        for entry_point in entry_points:
+            try:
+                file_type = entry_point.load()
+            except Exception as exc:
+                log.warning(f'Failed to load file type for extension {entry_point.name}: {exc}')
+                continue
+
+            # Skip file types which are already registered
+            if cls.file_types.get(entry_point.name.upper()) is file_type:
+                continue
+
+            cls.add_extension(entry_point.name, file_type)
+
 
 class Group(Item):
 
@@ -174,6 +217,7 @@ class Dataset(Item):
         self._shape: Tuple[int] = None
         self._maxshape: Tuple[Union[int,None]] = None
         self._dtype: type = None
+        self._chunks: Tuple[int] = None
         self._data: np.ndarray = None
         self.additional_data = {}
 
@@ -201,11 +245,56 @@ class Dataset(Item):
     def dtype(self, dtype):
         self._dtype = dtype
 
+    @property
+    def chunks(self) -> Tuple[int]:
+        return self._chunks
+
+    @chunks.setter
+    def chunks(self, chunks):
+        self._chunks = chunks
+
+    @property
+    def storage(self) -> Union[StorageInfo, None]:
+        return None
+
     @property
     def data(self):
         return self._data
 
 
+class StorageInfo:
+
+    def __init__(self, path: str, storage_size: int, logical_size: int,
+                 chunks: Tuple[int] = None, filters: Tuple[str] = ()):
+        self.path = path
+        self.storage_size = storage_size
+        self.logical_size = logical_size
+        self.chunks = chunks
+        self.filters = filters
+
+    def __repr__(self):
+        return f'StorageInfo("{self.path}")'
+
+    def __str__(self):
+        filters = ', '.join(self.filters) if len(self.filters) > 0 else 'no filters'
+        return f'{format_size(self.storage_size)} on disk, {format_size(self.logical_size)} logical ' \
+               f'(ratio {self.compression_ratio:.2f}), {filters}'
+
+    @property
+    def compression_ratio(self) -> float:
+        if self.storage_size == 0:
+            return 1.0 if self.logical_size == 0 else float('inf')
+        return self.logical_size / self.storage_size
+
+
+def format_size(nbytes: int) -> str:
+    size = float(nbytes)
+    for unit in ('B', 'KiB', 'MiB', 'GiB', 'TiB'):
+        if abs(size) < 1024 or unit == 'TiB':
+            break
+        size /= 1024
+
+    return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
 
 
 class Attribute(ABC):
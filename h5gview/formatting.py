@@ -0,0 +1,67 @@
+import logging
+from typing import Any, List, Sequence, Union
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+# Maximum number of array elements shown in single line representations
+max_inline_elements = 100
+
+
+def to_strings(data: np.ndarray) -> np.ndarray:
+    # Convert whole array to unicode strings at once
+    data = np.asarray(data)
+
+    if data.dtype.kind == 'U':
+        return data
+    if data.dtype.kind == 'S':
+        return np.char.decode(data, 'utf-8', errors='replace')
+    if data.dtype.kind == 'O':
+        # Variable length strings and bytes
+        flat = data.ravel()
+        if flat.size > 0 and isinstance(flat[0], bytes):
+            try:
+                return np.char.decode(flat.astype(np.bytes_), 'utf-8', errors='replace').reshape(data.shape)
+            except (TypeError, ValueError, UnicodeEncodeError):
+                pass
+    if data.dtype.kind in 'biufcmMO' and data.dtype.names is None:
+        try:
+            return data.astype(np.str_)
+        except (TypeError, ValueError, UnicodeEncodeError):
+            pass
+
+    # Fall back to element-wise conversion (e.g. records, subarrays, mixed objects)
+    return np.array([format_value(v) for v in data.ravel()], dtype=np.str_).reshape(data.shape)
+
+
+def format_columns(data: np.ndarray, fields: Union[Sequence[str], None] = None) -> List[np.ndarray]:
+    # One string array per compound field, or per column of a 2D block
+    if fields is not None:
+        return [_field_strings(data[name]) for name in fields]
+    if data.ndim == 1:
+        return [to_strings(data)]
+
+    return list(to_strings(data).T)
+
+
+def _field_strings(data: np.ndarray) -> np.ndarray:
+    # Subarray fields are shown as one string per record
+    if data.ndim > 1:
+        return np.array([format_value(v) for v in data], dtype=np.str_)
+    return to_strings(data)
+
+
+def format_value(value: Any) -> str:
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    if isinstance(value, np.void) and value.dtype.names is not None:
+        return '(' + ', '.join(format_value(value[name]) for name in value.dtype.names) + ')'
+    if isinstance(value, np.ndarray):
+        if value.ndim == 0:
+            return format_value(value[()])
+        strings = to_strings(value.ravel()[:max_inline_elements])
+        suffix = ', ...' if value.size > max_inline_elements else ''
+        return '[' + ', '.join(strings) + suffix + ']'
+
+    return str(value)
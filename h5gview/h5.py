@@ -1,5 +1,7 @@
 import h5py
 import logging
+import os
+from typing import Dict, List, Tuple
 
 from h5gview import core
 
@@ -8,6 +10,9 @@ log = logging.getLogger(__name__)
 
 class H5File(core.File):
 
+    # Handles opened by read_slice (one set per process), with modification time of file when opened
+    _slice_handles: Dict[str, Tuple[float, h5py.File]] = {}
+
     def __init__(self, *args):
         core.File.__init__(self, *args)
 
@@ -19,6 +24,29 @@ class H5File(core.File):
     def read(self):
         self._root_group = H5Group(self, self._file['/'])
 
+    @classmethod
+    def read_slice(cls, path, dataset_path, selection):
+        # Reopen files which were modified since they were opened
+        mtime = os.path.getmtime(path)
+        if path in cls._slice_handles and cls._slice_handles[path][0] != mtime:
+            cls._slice_handles.pop(path)[1].close()
+        if path not in cls._slice_handles:
+            cls._slice_handles[path] = mtime, h5py.File(path, 'r')
+        return cls._slice_handles[path][1][dataset_path][selection]
+
+    @classmethod
+    def scan_storage(cls, path):
+        infos = []
+
+        def _visit(_, obj):
+            if isinstance(obj, h5py.Dataset):
+                infos.append(_storage_info(obj))
+
+        with h5py.File(path, 'r') as f:
+            f.visititems(_visit)
+
+        return infos
+
 
 class H5Group(core.Group):
 
@@ -39,22 +67,7 @@ class H5Group(core.Group):
         return f'Group("{self.id}")'
 
     def _get_attributes(self):
-        attr_list = []
-        for attr_name, attr in self._group.attrs.items():
-            if hasattr(attr, 'dtype'):
-                attr_list.append(core.Attribute(self.file,
-                                                name=attr_name,
-                                                dtype=attr.dtype,
-                                                shape=attr.shape,
-                                                data=attr))
-            else:
-                attr_list.append(core.Attribute(self.file,
-                                                name=attr_name,
-                                                dtype=type(attr),
-                                                shape=len(attr),
-                                                data=attr))
-
-        return attr_list
+        return _get_attributes(self.file, self._group.attrs)
 
     def get(self):
         return {**{g.name: g for g in self.groups}, **{d.name: d for d in self.datasets}}
@@ -79,17 +92,52 @@ class H5Dataset(core.Dataset):
         self.shape = self._dataset.shape
         self.maxshape = self._dataset.maxshape
         self.dtype = self._dataset.dtype
+        self.chunks = self._dataset.chunks
+        self.attributes = self._get_attributes()
 
         # Set data
         self._data = self._dataset
 
     def _get_attributes(self):
-        return [core.Attribute(self.file,
-                               name=name,
-                               dtype=self._dataset.attrs[name].dtype,
-                               shape=self._dataset.attrs[name].shape,
-                               data=self._dataset.attrs[name])
-                for name in self._dataset.attrs]
+        return _get_attributes(self.file, self._dataset.attrs)
 
     def __repr__(self):
         return f'Dataset("{self.id}")'
+
+    @property
+    def storage(self):
+        return _storage_info(self._dataset)
+
+
+def _get_attributes(file: core.File, attrs: h5py.AttributeManager) -> List[core.Attribute]:
+    attr_list = []
+    for attr_name, attr in attrs.items():
+        if hasattr(attr, 'dtype'):
+            attr_list.append(core.Attribute(file,
+                                            name=attr_name,
+                                            dtype=attr.dtype,
+                                            shape=attr.shape,
+                                            data=attr))
+        else:
+            attr_list.append(core.Attribute(file,
+                                            name=attr_name,
+                                            dtype=type(attr),
+                                            shape=len(attr),
+                                            data=attr))
+
+    return attr_list
+
+
+def _storage_info(dataset: h5py.Dataset) -> core.StorageInfo:
+    plist = dataset.id.get_create_plist()
+    filters = []
+    for i in range(plist.get_nfilters()):
+        _, _, values, name = plist.get_filter(i)
+        name = name.decode(errors='replace')
+        filters.append(f'{name}{list(values)}' if len(values) > 0 else name)
+
+    return core.StorageInfo(dataset.name,
+                            storage_size=dataset.id.get_storage_size(),
+                            logical_size=dataset.size * dataset.dtype.itemsize,
+                            chunks=dataset.chunks,
+                            filters=tuple(filters))
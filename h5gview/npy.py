@@ -0,0 +1,223 @@
+import json
+import logging
+import os
+import struct
+import zipfile
+from abc import abstractmethod
+from typing import Dict, Tuple, Union
+
+import numpy as np
+
+from h5gview import core
+
+log = logging.getLogger(__name__)
+
+
+class ArrayFile(core.File):
+
+    # Arrays opened by read_slice (one set per process), keyed by modification time of file when opened
+    _slice_arrays: Dict[Tuple[str, str], Tuple[float, np.ndarray]] = {}
+
+    def __init__(self, *args):
+        core.File.__init__(self, *args)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}("{self.id}")'
+
+    def read(self):
+        self._root_group = ArrayGroup(self, self.open_arrays(self.path))
+
+    @classmethod
+    @abstractmethod
+    def open_arrays(cls, path: str) -> Dict[str, np.ndarray]:
+        # Map arrays in file without reading them
+        pass
+
+    @classmethod
+    def read_slice(cls, path, dataset_path, selection):
+        # Remap arrays of files which were modified since they were mapped
+        key = path, dataset_path
+        mtime = os.path.getmtime(path)
+        if key not in cls._slice_arrays or cls._slice_arrays[key][0] != mtime:
+            cls._slice_arrays[key] = mtime, cls.open_arrays(path)[dataset_path.lstrip('/')]
+        return np.asarray(cls._slice_arrays[key][1][selection])
+
+    @classmethod
+    def scan_storage(cls, path):
+        # Single array per file: whole file (including header) counts as storage
+        return [core.StorageInfo(f'/{name}',
+                                 storage_size=os.path.getsize(path),
+                                 logical_size=int(np.prod(array.shape)) * array.dtype.itemsize)
+                for name, array in cls.open_arrays(path).items()]
+
+
+def _array_name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _memmap(path: str, dtype: np.dtype, shape: Tuple[int, ...], offset: int, order: str):
+    # Empty arrays can not be mapped
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype, order=order)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape, order=order)
+
+
+class NpyFile(ArrayFile):
+
+    @classmethod
+    def open_arrays(cls, path):
+        try:
+            array = np.load(path, mmap_mode='r')
+        except ValueError:
+            # Not mappable (e.g. empty arrays)
+            array = np.load(path)
+        return {_array_name(path): array}
+
+
+class NpzMember:
+
+    # Compressed .npz member, decompressed on first access
+    def __init__(self, path: str, name: str, shape: Tuple[int, ...], dtype: np.dtype):
+        self.path = path
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+        self._array: Union[np.ndarray, None] = None
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    def __getitem__(self, item):
+        if self._array is None:
+            log.debug(f'Load compressed member "{self.name}" of {self.path}')
+            with np.load(self.path) as npz:
+                self._array = npz[self.name]
+        return self._array[item]
+
+    def __array__(self, dtype=None):
+        return np.asarray(self[()], dtype=dtype)
+
+
+class NpzFile(ArrayFile):
+
+    @classmethod
+    def _members(cls, path: str):
+        with zipfile.ZipFile(path) as zf, open(path, 'rb') as raw:
+            for info in zf.infolist():
+                if not info.filename.endswith('.npy'):
+                    continue
+
+                with zf.open(info) as f:
+                    version = np.lib.format.read_magic(f)
+                    if version == (1, 0):
+                        shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+                    else:
+                        shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+                    header_size = f.tell()
+
+                # Data offset from local file header
+                raw.seek(info.header_offset + 26)
+                name_len, extra_len = struct.unpack('<HH', raw.read(4))
+                offset = info.header_offset + 30 + name_len + extra_len + header_size
+
+                yield info, info.filename[:-4], shape, fortran, dtype, offset
+
+    @classmethod
+    def open_arrays(cls, path):
+        arrays = {}
+        for info, name, shape, fortran, dtype, offset in cls._members(path):
+            # Only uncompressed members can be mapped
+            if info.compress_type == zipfile.ZIP_STORED and not dtype.hasobject:
+                arrays[name] = _memmap(path, dtype, shape, offset, 'F' if fortran else 'C')
+            else:
+                arrays[name] = NpzMember(path, name, shape, dtype)
+
+        return arrays
+
+    @classmethod
+    def scan_storage(cls, path):
+        infos = []
+        for info, name, shape, _, dtype, _ in cls._members(path):
+            filters = ('deflate',) if info.compress_type == zipfile.ZIP_DEFLATED else ()
+            infos.append(core.StorageInfo(f'/{name}',
+                                          storage_size=info.compress_size,
+                                          logical_size=int(np.prod(shape)) * dtype.itemsize,
+                                          filters=filters))
+
+        return infos
+
+
+class RawFile(ArrayFile):
+
+    # Layout is described in a JSON sidecar file "<file>.json", e.g.
+    # {"dtype": "uint16", "shape": [1000, 512, 512], "offset": 0, "order": "C"}
+    default_layout = dict(dtype='uint8', shape=None, offset=0, order='C')
+
+    @classmethod
+    def open_arrays(cls, path):
+        layout = dict(cls.default_layout)
+        sidecar = f'{path}.json'
+        if os.path.exists(sidecar):
+            with open(sidecar, 'r') as f:
+                layout.update(json.load(f))
+        else:
+            log.warning(f'No layout file {sidecar}, show {path} as bytes')
+
+        dtype = np.dtype(layout['dtype'])
+        if layout['shape'] is None:
+            shape = ((os.path.getsize(path) - layout['offset']) // dtype.itemsize,)
+        else:
+            shape = tuple(layout['shape'])
+
+        return {_array_name(path): _memmap(path, dtype, shape, layout['offset'], layout['order'])}
+
+
+class ArrayGroup(core.Group):
+
+    def __init__(self, file, arrays: Dict[str, np.ndarray]):
+        core.Group.__init__(self, file)
+        log.debug(f'Create {self} in {self.file}')
+
+        self.name = ''
+        self.path = '/'
+        self.datasets = [ArrayDataset(self.file, name, array) for name, array in arrays.items()]
+
+    def __repr__(self):
+        return f'Group("{self.id}")'
+
+    def get(self):
+        return {d.name: d for d in self.datasets}
+
+    def get_tree(self):
+        return {d.name: d for d in self.datasets}
+
+
+class ArrayDataset(core.Dataset):
+
+    def __init__(self, file, name: str, array: np.ndarray):
+        core.Dataset.__init__(self, file)
+        log.debug(f'Create {self} from array "{name}" in {self.file}')
+
+        self.name = name
+        self.path = f'/{name}'
+
+        self.file.filegroup.add_dataset(self)
+
+        # Set basic information
+        self.shape = tuple(array.shape)
+        self.maxshape = tuple(array.shape)
+        self.dtype = array.dtype
+
+        # Set data
+        self._data = array
+
+    def __repr__(self):
+        return f'Dataset("{self.id}")'
+
+    @property
+    def storage(self):
+        for info in type(self.file).scan_storage(self.file.path):
+            if info.path == self.path:
+                return info
+        return None
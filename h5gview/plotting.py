@@ -1,18 +1,27 @@
 import uuid
 
 import numpy as np
-from PySide6 import QtCore, QtWidgets
+from PySide6 import QtCore, QtGui, QtWidgets
 import pyqtgraph as pg
 from h5gview import core
+from h5gview import projection
+from h5gview import spectral
+
+
+def is_numeric(dataset: core.Dataset) -> bool:
+    return np.issubdtype(dataset.dtype, np.number) or np.issubdtype(dataset.dtype, np.bool_)
 
 
 def options(dataset: core.Dataset):
+    # Reductions are only offered for numeric data
+    numeric = is_numeric(dataset)
+    reductions = (PlotProjection,) if numeric else ()
     if len(dataset.shape) == 1:
-        return Plot1D,
+        return (Plot1D, PlotSpectrum) if numeric else (Plot1D,)
     elif len(dataset.shape) == 2:
-        return Plot1D, PlotImage,
+        return (Plot1D, PlotImage) + reductions
     elif len(dataset.shape) > 2:
-        return Plot1D, PlotImage, PlotImageSeries
+        return (Plot1D, PlotImage, PlotImageSeries) + reductions
     return ()
 
 
@@ -97,3 +106,208 @@ class PlotImage(Plot):
 
 class PlotImageSeries(Plot):
     pass
+
+
+class PlotProjection(Plot):
+
+    def __init__(self, parent, dataset: core.Dataset):
+        Plot.__init__(self, parent, dataset)
+        self.setLayout(QtWidgets.QVBoxLayout())
+
+        # Add controls
+        self._controls = QtWidgets.QWidget()
+        self._controls.setLayout(QtWidgets.QHBoxLayout())
+        self._controls.layout().setContentsMargins(0, 0, 0, 0)
+        self.layout().addWidget(self._controls)
+
+        self.axis = QtWidgets.QComboBox()
+        self.axis.addItems([f'Axis {i} ({n})' for i, n in enumerate(dataset.shape)])
+        self.axis.currentIndexChanged.connect(self._start_projection)
+        self._controls.layout().addWidget(self.axis)
+
+        self.method = QtWidgets.QComboBox()
+        self.method.addItems(projection.Projection.methods)
+        self.method.currentIndexChanged.connect(self._update_plot)
+        self._controls.layout().addWidget(self.method)
+
+        self.progress = QtWidgets.QProgressBar()
+        self._controls.layout().addWidget(self.progress)
+
+        self.error = QtWidgets.QLabel()
+        self.error.setStyleSheet('color: red')
+        self.error.hide()
+        self.layout().addWidget(self.error)
+
+        # Add plot widgets (line plot for 1D projections, image otherwise)
+        self._plot_widget = pg.PlotWidget(background='white')
+        self.layout().addWidget(self._plot_widget)
+        self._image_view = pg.ImageView()
+        self.layout().addWidget(self._image_view)
+
+        geo = self.screen().geometry()
+        self.resize(geo.width()//3, geo.height()//3)
+
+        self._projection: projection.Projection = None
+
+        # Poll worker results
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(200)
+        self._timer.timeout.connect(self._poll_projection)
+
+        self._start_projection()
+        self.show()
+
+    def _start_projection(self):
+        if self._projection is not None:
+            self._projection.cancel()
+
+        self._projection = projection.Projection(self.dataset, self.axis.currentIndex())
+        self._projection.start()
+        self._auto_range = True
+
+        one_dim = len(self._projection.out_shape) == 1
+        self._plot_widget.setVisible(one_dim)
+        self._image_view.setVisible(not one_dim)
+
+        self._update_plot()
+        self._timer.start()
+
+    def _poll_projection(self):
+        if self._projection.update():
+            self._update_plot()
+
+        if self._projection.done or self._projection.error is not None:
+            self._timer.stop()
+
+    def _update_plot(self):
+        proj = self._projection
+        if proj.done:
+            self.progress.setValue(100)
+        else:
+            self.progress.setValue(100 * proj.blocks_done // max(proj.block_num, 1))
+
+        self.error.setVisible(proj.error is not None)
+        if proj.error is not None:
+            self.error.setText(f'Projection failed: {proj.error}')
+
+        data = np.nan_to_num(proj.result(self.method.currentText()))
+        if len(proj.out_shape) == 1:
+            self._plot_widget.clear()
+            self._plot_widget.plot(y=data, pen=pg.mkPen('black'))
+        else:
+            self._image_view.setImage(data, autoRange=self._auto_range)
+            self._auto_range = False
+
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:
+        self._timer.stop()
+        self._projection.cancel()
+        event.accept()
+
+
+class PlotSpectrum(Plot):
+
+    modes = ('Welch PSD', 'Spectrogram')
+    segment_lengths = (256, 512, 1024, 2048, 4096, 8192)
+
+    def __init__(self, parent, dataset: core.Dataset):
+        Plot.__init__(self, parent, dataset)
+        self.setLayout(QtWidgets.QVBoxLayout())
+
+        # Add controls
+        self._controls = QtWidgets.QWidget()
+        self._controls.setLayout(QtWidgets.QHBoxLayout())
+        self._controls.layout().setContentsMargins(0, 0, 0, 0)
+        self.layout().addWidget(self._controls)
+
+        self.mode = QtWidgets.QComboBox()
+        self.mode.addItems(self.modes)
+        self.mode.currentIndexChanged.connect(self._update_plot)
+        self._controls.layout().addWidget(self.mode)
+
+        self.nperseg = QtWidgets.QComboBox()
+        self.nperseg.addItems([str(n) for n in self.segment_lengths])
+        self.nperseg.setCurrentText('1024')
+        self.nperseg.currentIndexChanged.connect(self._start_spectrum)
+        self._controls.layout().addWidget(self.nperseg)
+
+        self.fs = QtWidgets.QDoubleSpinBox()
+        self.fs.setPrefix('fs ')
+        self.fs.setRange(10**-6, 10**9)
+        self.fs.setDecimals(3)
+        self.fs.setValue(1.0)
+        self.fs.editingFinished.connect(self._start_spectrum)
+        self._controls.layout().addWidget(self.fs)
+
+        self.progress = QtWidgets.QProgressBar()
+        self._controls.layout().addWidget(self.progress)
+
+        self.error = QtWidgets.QLabel()
+        self.error.setStyleSheet('color: red')
+        self.error.hide()
+        self.layout().addWidget(self.error)
+
+        # Add plot widgets
+        self._plot_widget = pg.PlotWidget(background='white')
+        self._plot_widget.setLogMode(y=True)
+        self._plot_widget.setLabel('bottom', 'Frequency')
+        self.layout().addWidget(self._plot_widget)
+        self._image_view = pg.ImageView()
+        self.layout().addWidget(self._image_view)
+
+        geo = self.screen().geometry()
+        self.resize(geo.width()//3, geo.height()//3)
+
+        self._spectrum: spectral.Spectrum = None
+
+        # Poll worker results
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(200)
+        self._timer.timeout.connect(self._poll_spectrum)
+
+        self._start_spectrum()
+        self.show()
+
+    def _start_spectrum(self):
+        if self._spectrum is not None:
+            self._spectrum.cancel()
+
+        self._spectrum = spectral.Spectrum(self.dataset, int(self.nperseg.currentText()), self.fs.value())
+        self._spectrum.start()
+        self._auto_range = True
+
+        self._update_plot()
+        self._timer.start()
+
+    def _poll_spectrum(self):
+        if self._spectrum.update():
+            self._update_plot()
+
+        if self._spectrum.done or self._spectrum.error is not None:
+            self._timer.stop()
+
+    def _update_plot(self):
+        spec = self._spectrum
+        self.progress.setValue(100 * spec.segments_done // max(spec.segment_num, 1))
+
+        self.error.setVisible(spec.error is not None)
+        if spec.error is not None:
+            self.error.setText(f'Spectrum failed: {spec.error}')
+
+        welch = self.mode.currentText() == 'Welch PSD'
+        self._plot_widget.setVisible(welch)
+        self._image_view.setVisible(not welch)
+
+        if welch:
+            self._plot_widget.clear()
+            # Skip DC component on log scale
+            self._plot_widget.plot(x=spec.freqs[1:], y=spec.psd()[1:], pen=pg.mkPen('black'))
+        else:
+            with np.errstate(divide='ignore'):
+                data = np.nan_to_num(np.log10(spec.spectrogram()), nan=0.0, neginf=0.0)
+            self._image_view.setImage(data, autoRange=self._auto_range)
+            self._auto_range = False
+
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:
+        self._timer.stop()
+        self._spectrum.cancel()
+        event.accept()
@@ -0,0 +1,187 @@
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Set, Tuple, Type, Union
+
+import numpy as np
+from PySide6 import QtCore, QtGui
+
+from h5gview import core
+from h5gview import workers
+
+log = logging.getLogger(__name__)
+
+# Width and height of previews in pixels
+size = (64, 24)
+
+# Limits of persistent preview cache
+max_cache_files = 10000
+max_cache_age = 30 * 24 * 3600
+
+
+def _read_preview(file_type: Type[core.File], file_path: str, dataset_path: str,
+                  shape: Tuple[int, ...]) -> np.ndarray:
+    # Strided read: sparkline for 1D, thumbnail for 2D, first frame for >2D
+    width, height = size
+    if len(shape) == 1:
+        selection = (slice(None, None, max(shape[0] // (2 * width), 1)),)
+    else:
+        selection = (0,) * (len(shape) - 2) + (slice(None, None, max(shape[-2] // height, 1)),
+                                               slice(None, None, max(shape[-1] // width, 1)))
+
+    return np.asarray(file_type.read_slice(file_path, dataset_path, selection), dtype=np.float64)
+
+
+def can_preview(dataset: core.Dataset) -> bool:
+    if dataset.shape is None or len(dataset.shape) == 0 or np.prod(dataset.shape) == 0:
+        return False
+    return np.issubdtype(dataset.dtype, np.number) or np.issubdtype(dataset.dtype, np.bool_)
+
+
+def to_pixmap(data: np.ndarray) -> QtGui.QPixmap:
+    width, height = size
+    data = np.nan_to_num(data)
+    dmin, dmax = np.min(data), np.max(data)
+    norm = (data - dmin) / (dmax - dmin) if dmax > dmin else np.zeros_like(data)
+
+    # Sparkline
+    if data.ndim == 1:
+        pixmap = QtGui.QPixmap(width, height)
+        pixmap.fill(QtCore.Qt.GlobalColor.transparent)
+        x = np.linspace(0, width - 1, norm.shape[0])
+        y = (height - 1) * (1 - norm)
+        painter = QtGui.QPainter(pixmap)
+        painter.setPen(QtGui.QPen(QtGui.QColor('black')))
+        painter.drawPolyline([QtCore.QPointF(xi, yi) for xi, yi in zip(x, y)])
+        painter.end()
+        return pixmap
+
+    # Thumbnail
+    image_data = np.ascontiguousarray((255 * norm).astype(np.uint8))
+    image = QtGui.QImage(image_data.data, image_data.shape[1], image_data.shape[0],
+                         image_data.strides[0], QtGui.QImage.Format.Format_Grayscale8)
+    return QtGui.QPixmap.fromImage(image.copy()).scaled(width, height, QtCore.Qt.AspectRatioMode.KeepAspectRatio)
+
+
+class Previews:
+
+    def __init__(self, cache_dir: str = None):
+        if cache_dir is None:
+            cache_home = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+            cache_dir = os.path.join(cache_home, 'h5gview', 'previews')
+        self.cache_dir = cache_dir
+
+        self._pixmaps: Dict[str, QtGui.QPixmap] = {}
+        self._futures: Dict[Future, Tuple[core.Dataset, str]] = {}
+        self._pending: Dict[str, Future] = {}
+        self._failed: Set[str] = set()
+        self._writes = 0
+
+        self.prune_cache()
+
+    @property
+    def pending(self) -> bool:
+        return len(self._futures) > 0
+
+    def _key(self, dataset: core.Dataset) -> str:
+        mtime = os.path.getmtime(dataset.file.path)
+        ident = f'{dataset.file.path}:{mtime}:{dataset.path}:{size}'
+        return hashlib.sha1(ident.encode()).hexdigest()
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.npy')
+
+    def prune_cache(self):
+        # Remove cached previews which are too old, then oldest ones above file limit
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        now = time.time()
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith('.npy'):
+                continue
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                continue
+
+        entries.sort(reverse=True)
+        for i, (mtime, path) in enumerate(entries):
+            if i >= max_cache_files or now - mtime > max_cache_age:
+                try:
+                    os.remove(path)
+                except OSError as exc:
+                    log.warning(f'Failed to remove cached preview {path}: {exc}')
+
+    def get(self, dataset: core.Dataset) -> Union[QtGui.QPixmap, None]:
+        key = self._key(dataset)
+        if key in self._pixmaps:
+            return self._pixmaps[key]
+
+        # Load from persistent cache
+        path = self._cache_path(key)
+        if os.path.exists(path):
+            try:
+                self._pixmaps[key] = to_pixmap(np.load(path))
+                os.utime(path)
+            except (OSError, ValueError) as exc:
+                log.warning(f'Failed to load cached preview {path}: {exc}')
+                return None
+            return self._pixmaps[key]
+
+        return None
+
+    def request(self, dataset: core.Dataset):
+        key = self._key(dataset)
+        if key in self._pixmaps or key in self._pending or key in self._failed:
+            return
+
+        file = dataset.file
+        future = workers.low_priority_pool().submit(_read_preview, type(file), file.path, dataset.path, dataset.shape)
+        self._futures[future] = dataset, key
+        self._pending[key] = future
+
+    def discard(self, dataset: core.Dataset):
+        # Drop request if it has not been started yet
+        key = self._key(dataset)
+        future = self._pending.get(key)
+        if future is not None and future.cancel():
+            del self._futures[future]
+            del self._pending[key]
+
+    def update(self) -> List[Tuple[core.Dataset, QtGui.QPixmap]]:
+        # Render finished previews and write them to the persistent cache
+        results = []
+        for future in [f for f in self._futures if f.done()]:
+            dataset, key = self._futures.pop(future)
+            del self._pending[key]
+            try:
+                data = future.result()
+            except Exception as exc:
+                log.warning(f'Failed to read preview of {dataset}: {exc}')
+                self._failed.add(key)
+                continue
+
+            self._pixmaps[key] = to_pixmap(data)
+            results.append((dataset, self._pixmaps[key]))
+
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                np.save(self._cache_path(key), data)
+            except OSError as exc:
+                log.warning(f'Failed to write preview cache: {exc}')
+
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self.prune_cache()
+
+        return results
+
+    def cancel(self):
+        for future in self._futures:
+            future.cancel()
+        self._futures.clear()
+        self._pending.clear()
@@ -0,0 +1,120 @@
+import logging
+from concurrent.futures import Future
+from typing import Dict, List, Tuple, Type, Union
+
+import numpy as np
+
+from h5gview import core
+from h5gview import workers
+
+log = logging.getLogger(__name__)
+
+
+def _reduce_block(file_type: Type[core.File], file_path: str, dataset_path: str,
+                  selection: Tuple[slice, ...], axis: int):
+    data = np.asarray(file_type.read_slice(file_path, dataset_path, selection), dtype=np.float64)
+    mean = np.mean(data, axis=axis)
+    m2 = np.sum((data - np.expand_dims(mean, axis)) ** 2, axis=axis)
+
+    return data.shape[axis], np.max(data, axis=axis), mean, m2
+
+
+class Projection:
+
+    methods = ('max', 'mean', 'std')
+
+    def __init__(self, dataset: core.Dataset, axis: int):
+        self.dataset = dataset
+        self.axis = axis
+
+        self.out_shape = tuple(n for i, n in enumerate(dataset.shape) if i != axis)
+        self._count = np.zeros(self.out_shape)
+        self._max = np.full(self.out_shape, np.nan)
+        self._mean = np.zeros(self.out_shape)
+        self._m2 = np.zeros(self.out_shape)
+
+        self._futures: Dict[Future, Tuple[slice, ...]] = {}
+        self.block_num = 0
+        self.blocks_done = 0
+        self.error: Union[str, None] = None
+
+        # Reuse reduction computed earlier for this dataset
+        cached = self.dataset.additional_data.get(self.cache_key)
+        if cached is not None:
+            log.debug(f'Use cached projection along axis {axis} of {dataset}')
+            self._count, self._max, self._mean, self._m2 = cached
+
+    def __repr__(self):
+        return f'Projection({self.dataset}, axis={self.axis})'
+
+    @property
+    def cache_key(self):
+        return 'projection', self.axis
+
+    @property
+    def done(self) -> bool:
+        return self.cache_key in self.dataset.additional_data
+
+    def start(self):
+        if self.done:
+            return
+
+        log.info(f'Start {self}')
+        itemsize = max(np.dtype(self.dataset.dtype).itemsize, 8)
+        block = workers.block_shape(self.dataset.shape, self.dataset.chunks, itemsize)
+        pool = workers.process_pool()
+        file = self.dataset.file
+        for selection in workers.iter_blocks(self.dataset.shape, block):
+            future = pool.submit(_reduce_block, type(file), file.path, self.dataset.path, selection, self.axis)
+            self._futures[future] = selection
+        self.block_num = len(self._futures)
+
+    def cancel(self):
+        for future in self._futures:
+            future.cancel()
+        self._futures.clear()
+
+    def update(self) -> bool:
+        # Merge finished blocks into accumulators, returns True if anything changed
+        finished: List[Future] = [f for f in self._futures if f.done()]
+        for future in finished:
+            if future not in self._futures:
+                continue
+            selection = self._futures.pop(future)
+            out = tuple(s for i, s in enumerate(selection) if i != self.axis)
+            try:
+                n_b, max_b, mean_b, m2_b = future.result()
+            except Exception as exc:
+                log.warning(f'Failed to reduce block of {self}: {exc}')
+                self.error = f'{type(exc).__name__}: {exc}'
+                self.cancel()
+                break
+
+            # Combine partial statistics (Chan et al.)
+            n_a = self._count[out]
+            n = n_a + n_b
+            delta = mean_b - self._mean[out]
+            self._mean[out] += delta * n_b / n
+            self._m2[out] += m2_b + delta ** 2 * n_a * n_b / n
+            self._count[out] = n
+            self._max[out] = np.fmax(self._max[out], max_b)
+
+        self.blocks_done += len(finished)
+
+        if self.error is None and self.block_num > 0 and self.blocks_done == self.block_num:
+            log.info(f'Finished {self}')
+            self.dataset.additional_data[self.cache_key] = (self._count, self._max, self._mean, self._m2)
+
+        return len(finished) > 0
+
+    def result(self, method: str) -> np.ndarray:
+        # Elements without any processed block yet are NaN
+        covered = self._count > 0
+        if method == 'max':
+            return self._max.copy()
+        elif method == 'mean':
+            return np.where(covered, self._mean, np.nan)
+        elif method == 'std':
+            return np.where(covered, np.sqrt(self._m2 / np.maximum(self._count, 1)), np.nan)
+
+        raise ValueError(f'Unknown projection method "{method}"')
@@ -0,0 +1,299 @@
+import logging
+import os
+import posixpath
+import zlib
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Dict, List, Tuple, Type, Union
+
+import h5py
+import numpy as np
+
+from h5gview import core
+from h5gview import workers
+
+log = logging.getLogger(__name__)
+
+# Target size of a single chunk in rewritten datasets
+target_chunk_bytes = 2**20
+
+
+def access_patterns(shape: Tuple[int, ...]) -> Dict[str, Tuple[int, ...]]:
+    # Extents of typical viewer reads (frame, trace and tile along first axis)
+    if len(shape) == 1:
+        return dict(window=(min(shape[0], 4096),), trace=shape)
+
+    return dict(frame=(1,) + tuple(shape[1:]),
+                trace=(shape[0],) + (1,) * (len(shape) - 1),
+                tile=(1,) * (len(shape) - 2) + tuple(min(n, 64) for n in shape[-2:]))
+
+
+def analyse(shape: Tuple[int, ...], chunks: Union[Tuple[int, ...], None],
+            itemsize: int) -> Dict[str, Tuple[int, float]]:
+    # Number of chunks touched and read amplification (bytes read / bytes used) per access pattern
+    if chunks is None:
+        return {}
+
+    chunk_bytes = int(np.prod(chunks)) * itemsize
+    results = {}
+    for name, extent in access_patterns(shape).items():
+        touched = int(np.prod([-(-e // c) for e, c in zip(extent, chunks)]))
+        used_bytes = max(int(np.prod(extent)) * itemsize, 1)
+        results[name] = touched, touched * chunk_bytes / used_bytes
+
+    return results
+
+
+# Relative importance of access patterns (frames are read most often by the viewer)
+pattern_weights = dict(frame=1.0, window=1.0, tile=0.5, trace=0.25)
+
+# Fixed cost of touching one chunk (lookup, seek, filter setup), in bytes
+chunk_overhead_bytes = 64 * 2**10
+
+
+def chunk_cost(shape: Tuple[int, ...], chunks: Tuple[int, ...], itemsize: int) -> Tuple[float, Dict[str, float]]:
+    # Cost per access pattern is bytes read (plus overhead per chunk) per byte used,
+    # total is the weighted sum of log costs, so that patterns with very different sizes are comparable
+    chunk_bytes = int(np.prod(chunks)) * itemsize
+    costs = {name: amplification * (1 + chunk_overhead_bytes / chunk_bytes)
+             for name, (_, amplification) in analyse(shape, chunks, itemsize).items()}
+
+    total = sum(pattern_weights.get(name, 1.0) * np.log(cost) for name, cost in costs.items())
+    return float(total), costs
+
+
+def _halved_chunks(shape: Tuple[int, ...], itemsize: int, target_bytes: int) -> Tuple[int, ...]:
+    chunks = [max(n, 1) for n in shape]
+    while np.prod(chunks) * itemsize > target_bytes and max(chunks) > 1:
+        i = int(np.argmax(chunks))
+        chunks[i] = -(-chunks[i] // 2)
+
+    return tuple(chunks)
+
+
+def candidate_chunks(shape: Tuple[int, ...], itemsize: int, target_bytes: int = None) -> List[Tuple[int, ...]]:
+    if target_bytes is None:
+        target_bytes = target_chunk_bytes
+
+    shape = tuple(max(n, 1) for n in shape)
+    candidates = {_halved_chunks(shape, itemsize, target_bytes)}
+
+    if len(shape) == 1:
+        length = 4096
+        while length < shape[0] and length * itemsize <= target_bytes:
+            candidates.add((length,))
+            length *= 2
+        candidates.add((min(shape[0], max(target_bytes // itemsize, 1)),))
+    else:
+        # Tiles over the last (up to two) axes, with as many frames along the first axis as fit into target size
+        tiled_axes = min(len(shape) - 1, 2)
+        for tile in (16, 32, 64, 128, 256, 512, 1024, max(shape[-tiled_axes:])):
+            spatial = shape[1:len(shape) - tiled_axes] + tuple(min(n, tile) for n in shape[-tiled_axes:])
+            spatial_bytes = int(np.prod(spatial)) * itemsize
+            if spatial_bytes > target_bytes:
+                continue
+            frames = min(max(target_bytes // spatial_bytes, 1), shape[0])
+            candidates.add((frames,) + spatial)
+
+    return sorted(candidates)
+
+
+def rank_chunks(shape: Tuple[int, ...], itemsize: int,
+                target_bytes: int = None) -> List[Tuple[float, Tuple[int, ...], Dict[str, float]]]:
+    ranked = []
+    for chunks in candidate_chunks(shape, itemsize, target_bytes):
+        total, costs = chunk_cost(shape, chunks, itemsize)
+        ranked.append((total, chunks, costs))
+
+    return sorted(ranked, key=lambda r: r[0])
+
+
+def suggest_chunks(shape: Tuple[int, ...], itemsize: int, target_bytes: int = None) -> Tuple[int, ...]:
+    # Candidate with lowest weighted cost over frame, trace and tile access
+    return rank_chunks(shape, itemsize, target_bytes)[0][1]
+
+
+def report(dataset: core.Dataset) -> str:
+    itemsize = np.dtype(dataset.dtype).itemsize
+    lines = [f'{dataset.path} {dataset.shape} {dataset.dtype} chunks {dataset.chunks or "contiguous"}']
+    if len(dataset.shape) == 0 or np.prod(dataset.shape) == 0:
+        return lines[0]
+
+    ranked = rank_chunks(dataset.shape, itemsize)
+    suggested = ranked[0][1]
+    current = analyse(dataset.shape, dataset.chunks, itemsize)
+    for name, (touched, amplification) in analyse(dataset.shape, suggested, itemsize).items():
+        if name in current:
+            now = f'{current[name][0]} chunk(s), {current[name][1]:.1f}x read'
+        else:
+            now = 'contiguous'
+        lines.append(f'  {name:<8}{now:<32}-> {touched} chunk(s), {amplification:.1f}x read')
+
+    # Explain choice
+    weights = ', '.join(f'{name} {pattern_weights.get(name, 1.0)}' for name in access_patterns(dataset.shape))
+    lines.append(f'  suggested chunks {suggested}: lowest weighted cost ({weights}) of {len(ranked)} candidates')
+    if dataset.chunks is not None:
+        lines.append(f'    current   {str(tuple(dataset.chunks)):<24} cost '
+                     f'{chunk_cost(dataset.shape, dataset.chunks, itemsize)[0]:.2f}')
+    for total, chunks, costs in ranked[:3]:
+        details = ', '.join(f'{name} {cost:.1f}x' for name, cost in costs.items())
+        lines.append(f'    candidate {str(chunks):<24} cost {total:.2f} ({details})')
+
+    return '\n'.join(lines)
+
+
+def _shuffle(raw: bytes, itemsize: int) -> bytes:
+    # Same byte order as HDF5 shuffle filter: first bytes of all elements, then second bytes, ...
+    if itemsize == 1:
+        return raw
+    return np.frombuffer(raw, dtype=np.uint8).reshape(-1, itemsize).T.tobytes()
+
+
+def _read_block(file_type: Type[core.File], file_path: str, dataset_path: str,
+                selection: Tuple[slice, ...]) -> np.ndarray:
+    return np.asarray(file_type.read_slice(file_path, dataset_path, selection))
+
+
+def _encode_block(file_type: Type[core.File], file_path: str, dataset_path: str, selection: Tuple[slice, ...],
+                  chunks: Tuple[int, ...], compression_opts: Union[int, None],
+                  shuffle: bool) -> List[Tuple[Tuple[int, ...], bytes]]:
+    # Read block and encode all its chunks for write_direct_chunk (shuffle + deflate, like the HDF5 filters)
+    data = np.asarray(file_type.read_slice(file_path, dataset_path, selection))
+    block = tuple(s.stop - s.start for s in selection)
+
+    encoded = []
+    for sub in workers.iter_blocks(block, chunks):
+        chunk = np.zeros(chunks, dtype=data.dtype)
+        chunk[tuple(slice(0, s.stop - s.start) for s in sub)] = data[sub]
+        raw = chunk.tobytes()
+        if shuffle:
+            raw = _shuffle(raw, data.dtype.itemsize)
+        if compression_opts is not None:
+            raw = zlib.compress(raw, compression_opts)
+        encoded.append((tuple(s.start + o.start for s, o in zip(sub, selection)), raw))
+
+    return encoded
+
+
+def _copy_attributes(item: Union[core.Group, core.Dataset], target: Union[h5py.Group, h5py.Dataset]):
+    for attr in item.attributes:
+        try:
+            target.attrs[attr.name] = attr.data
+        except (TypeError, ValueError) as exc:
+            log.warning(f'Failed to copy attribute "{attr.name}" of {item.path}: {exc}')
+
+
+def _groups(group: core.Group) -> Dict[str, core.Group]:
+    groups = {group.path: group}
+    for subgroup in group.groups:
+        groups.update(_groups(subgroup))
+
+    return groups
+
+
+def _copy_blocks(dataset: core.Dataset, target: h5py.Dataset, compression: Union[str, None],
+                 compression_opts: Union[int, None], shuffle: bool, max_memory: int):
+    # Read and encode chunk-aligned blocks in parallel, write encoded chunks directly in order of completion
+    file = dataset.file
+    dtype = np.dtype(dataset.dtype)
+    pool = workers.process_pool()
+
+    # Split memory budget across blocks in flight
+    max_pending = max(os.cpu_count(), 1)
+    block = workers.block_shape(dataset.shape, target.chunks, dtype.itemsize, max(max_memory // max_pending, 1))
+    block_bytes = int(np.prod(block)) * dtype.itemsize
+    max_pending = max(min(max_pending, max_memory // max(block_bytes, 1)), 1)
+
+    # Encoding in workers is only possible for fixed size types and filters which are implemented here
+    direct = not dtype.hasobject and compression in (None, 'gzip')
+
+    def _write(future, selection):
+        if direct:
+            for offset, raw in future.result():
+                target.id.write_direct_chunk(offset, raw)
+        else:
+            target[selection] = future.result()
+
+    pending = {}
+    for selection in workers.iter_blocks(dataset.shape, block):
+        # Bound memory by number of blocks in flight
+        if len(pending) >= max_pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                _write(future, pending.pop(future))
+
+        if direct:
+            future = pool.submit(_encode_block, type(file), file.path, dataset.path, selection, target.chunks,
+                                 compression_opts, shuffle)
+        else:
+            future = pool.submit(_read_block, type(file), file.path, dataset.path, selection)
+        pending[future] = selection
+
+    for future in wait(pending).done:
+        _write(future, pending[future])
+
+
+def select_datasets(filegroup: core.FileGroup, names: List[str] = None) -> List[core.Dataset]:
+    # Dataset names may be given with or without leading "/"
+    if names is None:
+        return list(filegroup.datasets)
+
+    paths = ['/' + name.lstrip('/') for name in names]
+    available = {d.path: d for d in filegroup.datasets}
+    unknown = [path for path in paths if path not in available]
+    if len(unknown) > 0:
+        raise ValueError(f'Unknown dataset(s) {", ".join(unknown)} in {filegroup}')
+
+    return [available[path] for path in paths]
+
+
+def repack(filegroup: core.FileGroup, dst_path: str, dataset_paths: List[str] = None,
+           chunks: Tuple[int, ...] = None, compression: str = 'gzip', compression_opts: int = None,
+           shuffle: bool = True, max_memory: int = 256 * 2**20):
+    if len(filegroup.files) != 1:
+        raise ValueError(f'{filegroup} must contain exactly one file to repack')
+
+    # Compression level only applies to gzip (default 4), other filters take their own options or none
+    if compression is None:
+        compression_opts = None
+    elif compression == 'gzip' and compression_opts is None:
+        compression_opts = 4
+
+    file = list(filegroup.files.values())[0]
+    groups = _groups(file.get())
+    datasets = select_datasets(filegroup, dataset_paths)
+    log.info(f'Repack {len(datasets)} dataset(s) of {file.path} to {dst_path}')
+
+    # Fail if output file exists
+    with h5py.File(dst_path, 'w-') as dst:
+        _copy_attributes(file.get(), dst)
+        copied_groups = {'/'}
+
+        for dataset in datasets:
+            # Create parent groups
+            parent_path = posixpath.dirname(dataset.path)
+            parent = dst.require_group(parent_path)
+            parts = [p for p in parent_path.split('/') if p != '']
+            for i in range(1, len(parts) + 1):
+                group_path = '/' + '/'.join(parts[:i])
+                if group_path in groups and group_path not in copied_groups:
+                    _copy_attributes(groups[group_path], dst[group_path])
+                    copied_groups.add(group_path)
+
+            # Scalar and empty datasets can not be chunked
+            if len(dataset.shape) == 0 or np.prod(dataset.shape) == 0:
+                target = parent.create_dataset(dataset.name, shape=dataset.shape, dtype=dataset.dtype)
+                if len(dataset.shape) == 0:
+                    target[()] = dataset.data[()]
+                _copy_attributes(dataset, target)
+                continue
+
+            new_chunks = chunks if chunks is not None else suggest_chunks(dataset.shape,
+                                                                          np.dtype(dataset.dtype).itemsize)
+            log.info(f'Rewrite {dataset.path} {dataset.shape} with chunks {dataset.chunks} -> {new_chunks}')
+            target = parent.create_dataset(dataset.name, shape=dataset.shape, dtype=dataset.dtype,
+                                           maxshape=dataset.maxshape, chunks=new_chunks,
+                                           compression=compression,
+                                           compression_opts=compression_opts,
+                                           shuffle=shuffle)
+            _copy_attributes(dataset, target)
+            _copy_blocks(dataset, target, compression, compression_opts, shuffle, max_memory)
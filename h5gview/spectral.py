@@ -0,0 +1,125 @@
+import logging
+from concurrent.futures import Future
+from typing import Set, Tuple, Union
+
+import numpy as np
+
+from h5gview import core
+from h5gview import workers
+
+log = logging.getLogger(__name__)
+
+
+class Spectrum:
+
+    # Number of segments read and transformed per block
+    block_segments = 256
+    # Maximum number of time bins of the spectrogram
+    max_time_bins = 1000
+
+    def __init__(self, dataset: core.Dataset, nperseg: int = 1024, fs: float = 1.0):
+        self.dataset = dataset
+        self.fs = fs
+
+        sample_num = dataset.shape[0]
+        self.nperseg = min(nperseg, sample_num)
+        self.step = max(self.nperseg // 2, 1)
+        self.segment_num = (sample_num - self.nperseg) // self.step + 1 if self.nperseg > 0 else 0
+
+        # Hann window, density scaling
+        self.window = np.hanning(self.nperseg) if self.nperseg > 1 else np.ones(self.nperseg)
+        self.scale = 1.0 / (fs * np.sum(self.window ** 2)) if self.nperseg > 0 else 1.0
+        self.freqs = np.fft.rfftfreq(max(self.nperseg, 1), 1.0 / fs)
+
+        self.time_bin_num = min(self.segment_num, self.max_time_bins)
+
+        self._psd_sum = np.zeros(self.freqs.shape[0])
+        self._bin_sum = np.zeros((self.time_bin_num, self.freqs.shape[0]))
+        self._bin_count = np.zeros(self.time_bin_num)
+        self.segments_done = 0
+        self.error: Union[str, None] = None
+
+        self._futures: Set[Future] = set()
+
+    def __repr__(self):
+        return f'Spectrum({self.dataset}, nperseg={self.nperseg})'
+
+    @property
+    def done(self) -> bool:
+        return len(self._futures) == 0
+
+    def start(self):
+        log.info(f'Start {self}')
+
+        # Process blocks in scattered order, so that early estimates cover the whole signal
+        block_num = -(-self.segment_num // self.block_segments)
+        pool = workers.thread_pool()
+        for i in np.random.default_rng(0).permutation(block_num):
+            seg0 = int(i) * self.block_segments
+            seg1 = min(seg0 + self.block_segments, self.segment_num)
+            self._futures.add(pool.submit(self._compute_block, seg0, seg1))
+
+    def cancel(self):
+        for future in self._futures:
+            future.cancel()
+        self._futures.clear()
+
+    def _compute_block(self, seg0: int, seg1: int) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        start = seg0 * self.step
+        end = (seg1 - 1) * self.step + self.nperseg
+        x = np.asarray(self.dataset.data[start:end], dtype=np.float64)
+
+        # Overlapping segments as strided view, constant detrend
+        segments = np.lib.stride_tricks.sliding_window_view(x, self.nperseg)[::self.step]
+        segments = segments - np.mean(segments, axis=1, keepdims=True)
+        power = np.abs(np.fft.rfft(segments * self.window, axis=1)) ** 2 * self.scale
+
+        # One-sided spectrum
+        if self.nperseg % 2 == 0:
+            power[:, 1:-1] *= 2
+        else:
+            power[:, 1:] *= 2
+
+        # Sum segments per spectrogram time bin
+        bins = np.arange(seg0, seg1) * self.time_bin_num // self.segment_num
+        bin_ids, first = np.unique(bins, return_index=True)
+        bin_sums = np.add.reduceat(power, first, axis=0)
+        bin_counts = np.diff(np.append(first, bins.shape[0]))
+
+        return power.shape[0], power.sum(axis=0), bin_ids, bin_sums, bin_counts
+
+    def update(self) -> bool:
+        # Merge finished blocks, returns True if anything changed
+        finished = [f for f in self._futures if f.done()]
+        for future in finished:
+            if future not in self._futures:
+                continue
+            self._futures.remove(future)
+            if future.cancelled():
+                continue
+
+            try:
+                segment_num, psd_sum, bin_ids, bin_sums, bin_counts = future.result()
+            except Exception as exc:
+                log.warning(f'Failed to compute block of {self}: {exc}')
+                self.error = f'{type(exc).__name__}: {exc}'
+                self.cancel()
+                break
+
+            self.segments_done += segment_num
+            self._psd_sum += psd_sum
+            self._bin_sum[bin_ids] += bin_sums
+            self._bin_count[bin_ids] += bin_counts
+
+        if len(finished) > 0 and self.done:
+            log.info(f'Finished {self}')
+
+        return len(finished) > 0
+
+    def psd(self) -> np.ndarray:
+        return self._psd_sum / max(self.segments_done, 1)
+
+    def spectrogram(self) -> np.ndarray:
+        # Time bins without processed segments yet are NaN
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._bin_sum / self._bin_count[:, None]
@@ -0,0 +1,81 @@
+import logging
+import os
+from concurrent.futures import Future
+from typing import Dict, List, Type
+
+from h5gview import core
+from h5gview import workers
+
+log = logging.getLogger(__name__)
+
+
+def _scan_file(file_type: Type[core.File], file_path: str) -> List[core.StorageInfo]:
+    return file_type.scan_storage(file_path)
+
+
+def rollup(infos: List[core.StorageInfo]) -> Dict[str, core.StorageInfo]:
+    # Sum up dataset sizes for every (parent) group
+    groups: Dict[str, core.StorageInfo] = {}
+    for info in infos:
+        parts = info.path.strip('/').split('/')[:-1]
+        for i in range(len(parts) + 1):
+            group_path = '/' + '/'.join(parts[:i])
+            if group_path not in groups:
+                groups[group_path] = core.StorageInfo(group_path, 0, 0)
+            groups[group_path].storage_size += info.storage_size
+            groups[group_path].logical_size += info.logical_size
+
+    return groups
+
+
+class StorageScan:
+
+    def __init__(self, filegroup: core.FileGroup):
+        self.filegroup = filegroup
+
+        self.datasets: Dict[str, List[core.StorageInfo]] = {}
+        self.groups: Dict[str, Dict[str, core.StorageInfo]] = {}
+        self.files: Dict[str, core.StorageInfo] = {}
+        self._futures: Dict[Future, core.File] = {}
+
+    def __repr__(self):
+        return f'StorageScan({self.filegroup})'
+
+    @property
+    def done(self) -> bool:
+        return len(self._futures) == 0
+
+    def start(self):
+        log.info(f'Start {self}')
+
+        # One task per file
+        pool = workers.process_pool()
+        for file in self.filegroup.files.values():
+            self._futures[pool.submit(_scan_file, type(file), file.path)] = file
+
+    def cancel(self):
+        for future in self._futures:
+            future.cancel()
+        self._futures.clear()
+
+    def update(self) -> bool:
+        # Collect finished files, returns True if anything changed
+        finished = [f for f in self._futures if f.done()]
+        for future in finished:
+            file = self._futures.pop(future)
+            try:
+                infos = future.result()
+            except Exception as exc:
+                log.warning(f'Failed to scan storage of {file}: {exc}')
+                continue
+
+            self.datasets[file.path] = infos
+            self.groups[file.path] = rollup(infos)
+            self.files[file.path] = core.StorageInfo(file.path,
+                                                     storage_size=os.path.getsize(file.path),
+                                                     logical_size=sum(i.logical_size for i in infos))
+
+        if len(finished) > 0 and self.done:
+            log.info(f'Finished {self}')
+
+        return len(finished) > 0
@@ -1,9 +1,19 @@
-from typing import List, Union, Dict
+import os
+import uuid
+from collections import OrderedDict
+from typing import List, Tuple, Union, Dict
+
+import numpy as np
 from PySide6 import QtCore, QtGui, QtWidgets
 import logging
 
+from h5gview import compare
 from h5gview import core
+from h5gview import formatting
 from h5gview import plotting
+from h5gview import preview
+from h5gview import storage
+from h5gview import workers
 
 log = logging.getLogger(__name__)
 
@@ -96,6 +106,7 @@ class Main(QtWidgets.QWidget):
 
     def update_file_tree(self):
         self._file_tree.clear()
+        self._file_tree.clear_previews()
         self.filegroup_tree_items = []
 
         # Add FileGroups
@@ -115,11 +126,17 @@ class Main(QtWidgets.QWidget):
             # Expand FileGroup by default
             tl_item.setExpanded(True)
 
+        self._file_tree.update_previews()
+
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
 
         # Clear filegroup register (important if called multiple times within one session)
         core.FileGroup.filegroup_register.clear()
 
+        # Stop background work, so that exit does not wait for queued blocks
+        self._file_tree.clear_previews()
+        workers.shutdown()
+
         event.accept()
 
 
@@ -128,18 +145,83 @@ class FileTree(QtWidgets.QTreeWidget):
     def __init__(self, parent):
         QtWidgets.QTreeWidget.__init__(self, parent=parent)
 
-        self.setColumnCount(1)
+        self.setColumnCount(2)
         self.itemChanged.connect(self._resize_columns)
         self.itemCollapsed.connect(self._resize_columns)
         self.itemExpanded.connect(self._resize_columns)
-        self.setHeaderLabels(['Files'])
+        self.setHeaderLabels(['Files', 'Preview'])
 
         self.click_position = None
         self.plots = {}
+        self.reports = {}
+
+        # Previews for visible datasets
+        self.previews = preview.Previews()
+        self.setIconSize(QtCore.QSize(*preview.size))
+        self.itemExpanded.connect(self.update_previews)
+        self.itemCollapsed.connect(self.update_previews)
+        self.verticalScrollBar().valueChanged.connect(self.update_previews)
+        self._preview_items: Dict[str, QtWidgets.QTreeWidgetItem] = {}
+        self._preview_timer = QtCore.QTimer(self)
+        self._preview_timer.setInterval(200)
+        self._preview_timer.timeout.connect(self._poll_previews)
 
     def _resize_columns(self):
         self.resizeColumnToContents(0)
 
+    def _visible_items(self) -> List[QtWidgets.QTreeWidgetItem]:
+        items = []
+        item = self.itemAt(0, 0)
+        height = self.viewport().height()
+        while item is not None and self.visualItemRect(item).top() < height:
+            items.append(item)
+            item = self.itemBelow(item)
+
+        return items
+
+    def update_previews(self):
+        visible_items = self._visible_items()
+        visible_data = [item.data(0, QtCore.Qt.ItemDataRole.UserRole) for item in visible_items]
+        visible_ids = {d.id for d in visible_data if isinstance(d, core.Dataset)}
+
+        # Drop requests for rows which were scrolled out of view
+        for data_id in [i for i in self._preview_items if i not in visible_ids]:
+            tree_item = self._preview_items.pop(data_id)
+            self.previews.discard(tree_item.data(0, QtCore.Qt.ItemDataRole.UserRole))
+
+        for tree_item in visible_items:
+            data_item = tree_item.data(0, QtCore.Qt.ItemDataRole.UserRole)
+            if not isinstance(data_item, core.Dataset) or not preview.can_preview(data_item):
+                continue
+
+            pixmap = self.previews.get(data_item)
+            if pixmap is not None:
+                tree_item.setData(1, QtCore.Qt.ItemDataRole.DecorationRole, pixmap)
+                continue
+
+            self._preview_items[data_item.id] = tree_item
+            self.previews.request(data_item)
+
+        if self.previews.pending:
+            self._preview_timer.start()
+
+    def clear_previews(self):
+        self.previews.cancel()
+        self._preview_items.clear()
+
+    def _poll_previews(self):
+        for data_item, pixmap in self.previews.update():
+            tree_item = self._preview_items.pop(data_item.id, None)
+            if tree_item is not None:
+                tree_item.setData(1, QtCore.Qt.ItemDataRole.DecorationRole, pixmap)
+
+        if not self.previews.pending:
+            self._preview_timer.stop()
+
+    def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
+        QtWidgets.QTreeWidget.resizeEvent(self, event)
+        self.update_previews()
+
     def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
         QtWidgets.QTreeWidget.mousePressEvent(self, event)
 
@@ -153,6 +235,8 @@ class FileTree(QtWidgets.QTreeWidget):
     def _open_context_menu_on_item(self, data_item: Union[core.Dataset, core.Group, core.File]):
         if isinstance(data_item, core.Dataset):
             self._open_dataset_context_menu(data_item)
+        elif isinstance(data_item, core.File):
+            self._open_file_context_menu(data_item)
 
     def _open_dataset_context_menu(self, data_item: core.Dataset):
 
@@ -168,6 +252,26 @@ class FileTree(QtWidgets.QTreeWidget):
             self.context_menu.exec_(self.mapToGlobal(res))
         self.click_position = None
 
+    def _open_file_context_menu(self, data_item: core.File):
+
+        self.context_menu = QtWidgets.QMenu(self)
+        self.context_menu.addAction('Storage report', self._report(StorageReport, data_item.filegroup))
+        compare_action = self.context_menu.addAction('Compare files', self._report(CompareReport, data_item.filegroup))
+        compare_action.setEnabled(len(data_item.filegroup.files) > 1)
+
+        if self.click_position:
+            self.context_menu.exec_(self.mapToGlobal(self.click_position))
+        self.click_position = None
+
+    def _report(self, report_type: type, filegroup: core.FileGroup):
+        def _report():
+            log.debug(f'{report_type.__name__} for {filegroup}')
+            report = report_type(self, filegroup)
+            report.activateWindow()
+            self.reports[report.id] = report
+
+        return _report
+
     def _plot(self, plot_type: type, data_item: core.Dataset):
         def _plot():
             log.debug(f'{plot_type.__name__} for {data_item}')
@@ -200,7 +304,7 @@ class AttributeInfo(QtWidgets.QScrollArea):
         self.table.setRowCount(len(data_item.attributes))
         for i, attr in enumerate(data_item.attributes):
             self.table.setItem(i, 0, QtWidgets.QTableWidgetItem(attr.name))
-            self.table.setItem(i, 1, QtWidgets.QTableWidgetItem(str(attr.data)))
+            self.table.setItem(i, 1, QtWidgets.QTableWidgetItem(formatting.format_value(attr.data)))
             self.table.setItem(i, 2, QtWidgets.QTableWidgetItem(str(attr.dtype)))
             self.table.setItem(i, 3, QtWidgets.QTableWidgetItem(str(attr.shape)))
 
@@ -212,7 +316,9 @@ class ObjectInfo(QtWidgets.QScrollArea):
                             id='Object ID',
                             dtype='Datatype',
                             shape='Shape',
-                            maxshape='Maxshape')
+                            maxshape='Maxshape',
+                            chunks='Chunks',
+                            storage='Storage')
 
     show_for_group = ('name', 'path', 'object_ref')
     show_for_file = ('name', 'path', 'object_ref')
@@ -228,7 +334,7 @@ class ObjectInfo(QtWidgets.QScrollArea):
         for name, label in self.available_fields.items():
             self.all_fields[name] = ObjectInfoField(self, label)
             self.layout().addWidget(self.all_fields[name])
-        self.data_table = QtWidgets.QTableWidget()
+        self.data_table = QtWidgets.QTableView()
         self.data_table.setSizePolicy(QtWidgets.QSizePolicy.MinimumExpanding, QtWidgets.QSizePolicy.Expanding)
         self.layout().addWidget(self.data_table)
 
@@ -257,36 +363,89 @@ class ObjectInfo(QtWidgets.QScrollArea):
                 field.line_edit.setText(str(getattr(data_item, name)))
                 field.show()
 
-        # Update data table
-        self.data_table.clear()
-        if not isinstance(data_item, core.Dataset):
-            return
+        # Update data table (and drop previous model with its cached blocks)
+        previous_model = self.data_table.model()
+        if isinstance(data_item, core.Dataset):
+            self.data_table.setModel(DataTableModel(data_item, self.data_table))
+        else:
+            self.data_table.setModel(None)
+
+        if previous_model is not None:
+            previous_model.deleteLater()
+
+
+class DataTableModel(QtCore.QAbstractTableModel):
+
+    # Cells are read and formatted in blocks of rows and columns on demand
+    block_rows = 1000
+    block_columns = 100
+    max_cached_blocks = 16
+
+    def __init__(self, dataset: core.Dataset, parent=None):
+        QtCore.QAbstractTableModel.__init__(self, parent)
+        self.dataset = dataset
+        shape = dataset.shape
 
-        max_display_num = 10**5
-        if len(data_item.shape) == 1:
-            max_i = data_item.shape[0] if data_item.shape[0] <= max_display_num else max_display_num
-            self.data_table.setColumnCount(max_i)
-            self.data_table.setHorizontalHeaderLabels([str(i) for i in range(max_i)])
-            self.data_table.setRowCount(1)
+        # Columnar view for compound datasets (one column per field)
+        self.fields = dataset.dtype.names if len(shape) == 1 else None
 
-            for i in range(max_i):
-                self.data_table.setItem(0, i, QtWidgets.QTableWidgetItem(str(data_item.data[i])))
+        if len(shape) == 1:
+            self._row_num = shape[0]
+            self._column_num = len(self.fields) if self.fields is not None else 1
+        elif len(shape) == 2:
+            self._row_num, self._column_num = shape
+        else:
+            self._row_num = 0
+            self._column_num = 0
 
-            # Indicate croppped overflow
-            if data_item.shape[0] > max_i:
-                self.data_table.setColumnCount(max_i + 1)
-                self.data_table.setHorizontalHeaderItem(max_i, QtWidgets.QTableWidgetItem('Cropped values'))
-                self.data_table.setItem(0, max_i, QtWidgets.QTableWidgetItem('...'))
+        self._blocks: OrderedDict[Tuple[int, int], List[np.ndarray]] = OrderedDict()
 
-        elif len(data_item.shape) == 2:
-            self.data_table.setColumnCount(data_item.shape[0])
-            self.data_table.setHorizontalHeaderLabels([str(i) for i in range(data_item.shape[0])])
-            self.data_table.setRowCount(data_item.shape[1])
-            self.data_table.setVerticalHeaderLabels([str(i) for i in range(data_item.shape[1])])
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._row_num
 
-            for i in range(data_item.shape[0]):
-                for j in range(data_item.shape[1]):
-                    self.data_table.setItem(j, i, QtWidgets.QTableWidgetItem(str(data_item.data[i, j])))
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._column_num
+
+    def headerData(self, section, orientation, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Orientation.Horizontal:
+            if self.fields is not None:
+                return self.fields[section]
+            if len(self.dataset.shape) == 1:
+                return 'Value'
+        return str(section)
+
+    def data(self, index: QtCore.QModelIndex, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if role != QtCore.Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+
+        columns = self._block(index.row() // self.block_rows, index.column() // self.block_columns)
+        return str(columns[index.column() % self.block_columns][index.row() % self.block_rows])
+
+    def _block(self, i: int, j: int) -> List[np.ndarray]:
+        if (i, j) in self._blocks:
+            self._blocks.move_to_end((i, j))
+            return self._blocks[i, j]
+
+        r0 = i * self.block_rows
+        r1 = min(r0 + self.block_rows, self._row_num)
+        c0 = j * self.block_columns
+        c1 = min(c0 + self.block_columns, self._column_num)
+
+        fields = None
+        if len(self.dataset.shape) == 2:
+            data = np.asarray(self.dataset.data[r0:r1, c0:c1])
+        else:
+            data = np.asarray(self.dataset.data[r0:r1])
+            if self.fields is not None:
+                fields = self.fields[c0:c1]
+
+        self._blocks[i, j] = formatting.format_columns(data, fields)
+        if len(self._blocks) > self.max_cached_blocks:
+            self._blocks.popitem(last=False)
+
+        return self._blocks[i, j]
 
 
 class ObjectInfoField(QtWidgets.QWidget):
@@ -304,5 +463,152 @@ class ObjectInfoField(QtWidgets.QWidget):
         self.layout().addWidget(self.line_edit)
 
 
+class SizeTableItem(QtWidgets.QTableWidgetItem):
+
+    def __init__(self, text: str, value: float):
+        QtWidgets.QTableWidgetItem.__init__(self, text)
+        self.setData(QtCore.Qt.ItemDataRole.UserRole, value)
+
+    def __lt__(self, other: QtWidgets.QTableWidgetItem) -> bool:
+        value = other.data(QtCore.Qt.ItemDataRole.UserRole)
+        if value is None:
+            return QtWidgets.QTableWidgetItem.__lt__(self, other)
+        return self.data(QtCore.Qt.ItemDataRole.UserRole) < value
+
+
+class StorageReport(QtWidgets.QWidget):
+
+    columns = ['Type', 'File', 'Path', 'Storage size', 'Logical size', 'Ratio', 'Filters', 'Chunks']
+
+    def __init__(self, parent, filegroup: core.FileGroup):
+        QtWidgets.QWidget.__init__(self, parent=parent, f=QtCore.Qt.WindowType.Window)
+        self.id = str(uuid.uuid4())
+        self.setWindowTitle(f'Storage report for {filegroup}')
+        self.setLayout(QtWidgets.QVBoxLayout())
+
+        self.status = QtWidgets.QLabel('Scanning...')
+        self.layout().addWidget(self.status)
+
+        self.table = QtWidgets.QTableWidget()
+        self.table.setColumnCount(len(self.columns))
+        self.table.setHorizontalHeaderLabels(self.columns)
+        self.layout().addWidget(self.table)
+
+        geo = self.screen().geometry()
+        self.resize(geo.width()//2, geo.height()//2)
+
+        self._scan = storage.StorageScan(filegroup)
+        self._scan.start()
+
+        # Poll scan results
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(200)
+        self._timer.timeout.connect(self._poll_scan)
+        self._timer.start()
+
+        self.show()
+
+    def _poll_scan(self):
+        if self._scan.update():
+            self._update_table()
+
+        if self._scan.done:
+            self._timer.stop()
+            self.status.setText(f'Scanned {len(self._scan.files)} file(s)')
+
+    def _add_row(self, kind: str, file_path: str, info: core.StorageInfo):
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+
+        chunks = str(info.chunks) if info.chunks is not None else ''
+        self.table.setItem(row, 0, QtWidgets.QTableWidgetItem(kind))
+        self.table.setItem(row, 1, QtWidgets.QTableWidgetItem(os.path.basename(file_path)))
+        self.table.setItem(row, 2, QtWidgets.QTableWidgetItem(info.path))
+        self.table.setItem(row, 3, SizeTableItem(core.format_size(info.storage_size), info.storage_size))
+        self.table.setItem(row, 4, SizeTableItem(core.format_size(info.logical_size), info.logical_size))
+        self.table.setItem(row, 5, SizeTableItem(f'{info.compression_ratio:.2f}', info.compression_ratio))
+        self.table.setItem(row, 6, QtWidgets.QTableWidgetItem(', '.join(info.filters)))
+        self.table.setItem(row, 7, QtWidgets.QTableWidgetItem(chunks))
+
+    def _update_table(self):
+        # Disable sorting while filling in rows
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(0)
+
+        for file_path, file_info in self._scan.files.items():
+            self._add_row('File', file_path, file_info)
+            for group_info in self._scan.groups[file_path].values():
+                self._add_row('Group', file_path, group_info)
+            for dataset_info in self._scan.datasets[file_path]:
+                self._add_row('Dataset', file_path, dataset_info)
+
+        self.table.setSortingEnabled(True)
+
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:
+        self._timer.stop()
+        self._scan.cancel()
+        event.accept()
+
+
+class CompareReport(QtWidgets.QWidget):
+
+    columns = ['Path', 'Status', 'Details']
+
+    def __init__(self, parent, filegroup: core.FileGroup):
+        QtWidgets.QWidget.__init__(self, parent=parent, f=QtCore.Qt.WindowType.Window)
+        self.id = str(uuid.uuid4())
+        self.setWindowTitle(f'Comparison of files in {filegroup}')
+        self.setLayout(QtWidgets.QVBoxLayout())
+
+        self.status = QtWidgets.QLabel('Comparing...')
+        self.layout().addWidget(self.status)
+
+        self.table = QtWidgets.QTableWidget()
+        self.table.setColumnCount(len(self.columns))
+        self.table.setHorizontalHeaderLabels(self.columns)
+        self.layout().addWidget(self.table)
+
+        geo = self.screen().geometry()
+        self.resize(geo.width()//2, geo.height()//2)
+
+        self._comparison = compare.Comparison(filegroup)
+        self._comparison.start()
+        self._update_table()
+
+        # Poll comparison results
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(200)
+        self._timer.timeout.connect(self._poll_comparison)
+        self._timer.start()
+
+        self.show()
+
+    def _poll_comparison(self):
+        if self._comparison.update():
+            self._update_table()
+
+        if self._comparison.done:
+            self._timer.stop()
+            summary = self._comparison.summary()
+            self.status.setText(', '.join(f'{len(paths)} {status}' for status, paths in summary.items()))
+
+    def _update_table(self):
+        # Disable sorting while filling in rows
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(self._comparison.results))
+
+        for row, result in enumerate(self._comparison.results.values()):
+            self.table.setItem(row, 0, QtWidgets.QTableWidgetItem(result.path))
+            self.table.setItem(row, 1, QtWidgets.QTableWidgetItem(result.status))
+            self.table.setItem(row, 2, QtWidgets.QTableWidgetItem(result.details))
+
+        self.table.setSortingEnabled(True)
+
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:
+        self._timer.stop()
+        self._comparison.cancel()
+        event.accept()
+
+
 if __name__ == '__main__':
     pass
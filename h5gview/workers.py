@@ -0,0 +1,87 @@
+import itertools
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterator, Tuple, Union
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+# Upper limit for the size of one block read by a worker
+max_block_bytes = 64 * 2**20
+
+_process_pool: Union[ProcessPoolExecutor, None] = None
+_thread_pool: Union[ThreadPoolExecutor, None] = None
+_low_priority_pool: Union[ProcessPoolExecutor, None] = None
+
+# Do not fork the GUI process: forked workers may inherit locks held by other threads (e.g. h5py's global lock)
+_mp_context = multiprocessing.get_context('spawn')
+
+
+def _lower_priority():
+    # Not available on all platforms
+    if hasattr(os, 'nice'):
+        os.nice(10)
+
+
+def process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        log.info('Start process pool')
+        _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=_mp_context)
+    return _process_pool
+
+
+def thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    if _thread_pool is None:
+        log.info('Start thread pool')
+        _thread_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+    return _thread_pool
+
+
+def low_priority_pool() -> ProcessPoolExecutor:
+    global _low_priority_pool
+    if _low_priority_pool is None:
+        log.info('Start low priority process pool')
+        _low_priority_pool = ProcessPoolExecutor(max_workers=max(os.cpu_count() // 2, 1),
+                                                 mp_context=_mp_context, initializer=_lower_priority)
+    return _low_priority_pool
+
+
+def shutdown():
+    # Drop queued work of all pools without waiting for it (running tasks still finish)
+    global _process_pool, _thread_pool, _low_priority_pool
+    for pool in (_process_pool, _thread_pool, _low_priority_pool):
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    _process_pool = None
+    _thread_pool = None
+    _low_priority_pool = None
+
+
+def block_shape(shape: Tuple[int, ...], chunks: Tuple[int, ...] = None,
+                itemsize: int = 8, max_bytes: int = None) -> Tuple[int, ...]:
+    if max_bytes is None:
+        max_bytes = max_block_bytes
+
+    # Start from chunk shape and grow axes (last, contiguous axis first) until block would exceed max_bytes
+    block = list(chunks) if chunks is not None else [1] * len(shape)
+    block = [min(max(b, 1), max(n, 1)) for b, n in zip(block, shape)]
+    for i in reversed(range(len(shape))):
+        while block[i] < shape[i]:
+            new = min(2 * block[i], shape[i])
+            if np.prod(block[:i] + [new] + block[i + 1:]) * itemsize > max_bytes:
+                break
+            block[i] = new
+
+    return tuple(block)
+
+
+def iter_blocks(shape: Tuple[int, ...], block: Tuple[int, ...]) -> Iterator[Tuple[slice, ...]]:
+    starts = [range(0, n, b) for n, b in zip(shape, block)]
+    for start in itertools.product(*starts):
+        yield tuple(slice(s, min(s + b, n)) for s, b, n in zip(start, block, shape))